@@ -11,6 +11,9 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     python_requires=">=3.10",
+    install_requires=[
+        "msgspec>=0.18",
+    ],
     entry_points={
         "console_scripts": [
             "simple-todo=simple_todo.main:main",
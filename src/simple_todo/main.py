@@ -1,7 +1,13 @@
 #!/usr/bin/env python3
 """Entry point for the Simple Todo List application."""
 
+import os
 import sys
+
+# Prefer the GPU renderer over cairo software compositing. GTK falls back
+# on its own when GL is unavailable; set GSK_RENDERER=cairo to force it.
+os.environ.setdefault("GSK_RENDERER", "ngl")
+
 import gi
 
 gi.require_version("Gtk", "4.0")
@@ -9,6 +15,7 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, Gio
 
 from . import __app_id__
+from .storage import Storage
 from .window import MainWindow
 
 
@@ -20,6 +27,18 @@ class SimpleTodoApp(Adw.Application):
             application_id=__app_id__,
             flags=Gio.ApplicationFlags.DEFAULT_FLAGS
         )
+        self.storage = None
+    
+    def do_startup(self):
+        """Called once when the application starts."""
+        Adw.Application.do_startup(self)
+        self.storage = Storage()
+    
+    def do_shutdown(self):
+        """Called when the application exits; writes out pending changes."""
+        if self.storage:
+            self.storage.close()
+        Adw.Application.do_shutdown(self)
     
     def do_activate(self):
         """Called when the application is activated."""
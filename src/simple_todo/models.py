@@ -1,64 +1,63 @@
 """Data models for the Simple Todo List application."""
 
+import time
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+import msgspec
 
-@dataclass
-class Task:
-    """Represents a single task in a to-do list."""
+
+class Task(msgspec.Struct, eq=False):
+    """Represents a single task in a to-do list.
+    
+    Models are msgspec Structs, so storage encodes and decodes them
+    directly without an intermediate dict representation.
+    """
     
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = msgspec.field(default_factory=lambda: uuid.uuid4().hex)
     title: str = ""
     completed: bool = False
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # UNIX timestamp; str only for ISO strings in files from older versions
+    created_at: float | str = msgspec.field(default_factory=time.time)
     
-    def to_dict(self) -> dict:
-        """Convert task to dictionary for JSON serialization."""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "completed": self.completed,
-            "created_at": self.created_at
-        }
-    
-    @classmethod
-    def from_dict(cls, data: dict) -> "Task":
-        """Create a Task from a dictionary."""
-        return cls(
-            id=data.get("id", str(uuid.uuid4())),
-            title=data.get("title", ""),
-            completed=data.get("completed", False),
-            created_at=data.get("created_at", datetime.now().isoformat())
-        )
+    def __post_init__(self):
+        if isinstance(self.created_at, str):
+            try:
+                self.created_at = datetime.fromisoformat(self.created_at).timestamp()
+            except ValueError:
+                self.created_at = time.time()
 
 
-@dataclass
-class TodoList:
-    """Represents a to-do list containing multiple tasks."""
+class TodoList(msgspec.Struct, dict=True, eq=False):
+    """Represents a to-do list containing multiple tasks.
+    
+    Unlike Task, TodoList keeps a per-instance __dict__ (dict=True) to hold
+    its task index and counts cache outside the serialized fields. That is
+    one dict per list, and lists are few; Task, the model there are many
+    of, stays fully slotted.
+    """
     
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = msgspec.field(default_factory=lambda: uuid.uuid4().hex)
     name: str = ""
-    tasks: list[Task] = field(default_factory=list)
+    tasks: list[Task] = msgspec.field(default_factory=list)
     
-    def to_dict(self) -> dict:
-        """Convert list to dictionary for JSON serialization."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "tasks": [task.to_dict() for task in self.tasks]
-        }
+    def __post_init__(self):
+        # Index tasks by ID for O(1) lookup; kept in sync by the methods below.
+        # Not a field (dict=True allows it), so it is never serialized.
+        self._tasks_by_id: dict[str, Task] = {t.id: t for t in self.tasks}
+        self._counts: Optional[tuple[int, int]] = None
     
-    @classmethod
-    def from_dict(cls, data: dict) -> "TodoList":
-        """Create a TodoList from a dictionary."""
-        return cls(
-            id=data.get("id", str(uuid.uuid4())),
-            name=data.get("name", ""),
-            tasks=[Task.from_dict(t) for t in data.get("tasks", [])]
-        )
+    @property
+    def counts(self) -> tuple[int, int]:
+        """Return (completed, total), computed once until the tasks change."""
+        if self._counts is None:
+            self._counts = (sum(1 for t in self.tasks if t.completed), len(self.tasks))
+        return self._counts
+    
+    def invalidate_counts(self) -> None:
+        """Drop the cached counts; call after changing a task's completion."""
+        self._counts = None
     
     def get_pending_tasks(self) -> list[Task]:
         """Return tasks that are not completed."""
@@ -71,21 +70,25 @@ class TodoList:
     def add_task(self, title: str) -> Task:
         """Add a new task to the list."""
         task = Task(title=title)
-        self.tasks.append(task)
+        self.append_task(task)
         return task
     
+    def append_task(self, task: Task) -> None:
+        """Append an existing task to the end of the list."""
+        self.tasks.append(task)
+        self._tasks_by_id[task.id] = task
+        self._counts = None
+    
     def remove_task(self, task_id: str) -> bool:
         """Remove a task by ID. Returns True if found and removed."""
-        for i, task in enumerate(self.tasks):
-            if task.id == task_id:
-                del self.tasks[i]
-                return True
-        return False
+        task = self._tasks_by_id.pop(task_id, None)
+        if task is None:
+            return False
+        self.tasks.remove(task)
+        self._counts = None
+        return True
     
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID."""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._tasks_by_id.get(task_id)
 
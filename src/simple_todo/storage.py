@@ -1,11 +1,15 @@
 """Storage layer for persisting to-do lists to JSON for Simple Todo List."""
 
-import json
 import os
 import re
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_for
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+import msgspec
+from gi.repository import GLib
 
 from .models import TodoList, Task
 
@@ -14,7 +18,45 @@ from .models import TodoList, Task
 MAX_LIST_NAME_LENGTH = 32
 MAX_TASK_TITLE_LENGTH = 256
 
+# Number of journaled mutations after which the journal is folded into data.json
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# Delay used to coalesce bursts of mutations into a single journal write
+SAVE_DELAY_MS = 200
+
+# Default data directory, per the XDG base directory spec (resolved once)
+_DEFAULT_DATA_DIR = Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local/share") / "simple-todo"
+
+
+class DataFile(msgspec.Struct):
+    """Schema of the data.json file."""
+    
+    lists: list[TodoList] = []
+    # Bumped by every compaction; journal records carry the generation they
+    # were made in, so records already folded into this snapshot are skipped
+    generation: int = 0
+
+
+# Reused across loads/saves so msgspec only builds its encoding plans once
+_ENCODER = msgspec.json.Encoder()
+_DECODER = msgspec.json.Decoder(DataFile)
+
+# Journal records are msgpack-encoded op dicts, each prefixed with its length
+_OP_ENCODER = msgspec.msgpack.Encoder()
+_OP_DECODER = msgspec.msgpack.Decoder()
+_OP_HEADER_SIZE = 4
+
+# Runs of spaces collapsed by sanitize_input
+_MULTI_SPACE = re.compile(r' +')
 
+# Control characters removed by sanitize_input (ASCII 0-31 except tab). The
+# translate table and the fast-path pattern are both compiled from this once.
+_CTRL_CHARS = "".join(chr(c) for c in range(32) if c != 9)
+_CTRL_DELETE = str.maketrans("", "", _CTRL_CHARS)
+_HAS_CTRL = re.compile(f"[{re.escape(_CTRL_CHARS)}]")
+
+
+@lru_cache(maxsize=1024)
 def sanitize_input(text: str, max_length: int) -> str:
     """Sanitize user input for safe storage.
     
@@ -26,18 +68,19 @@ def sanitize_input(text: str, max_length: int) -> str:
     if not text:
         return ""
     
-    # Remove null bytes and control characters (ASCII 0-31 except tab/newline/carriage return)
-    # For list names, we remove all control chars; for tasks we might keep newlines
-    sanitized = "".join(
-        char for char in text 
-        if ord(char) >= 32 or char in '\t'
-    )
+    # Fast path: already-clean input is returned as-is without copying
+    if (len(text) <= max_length and text == text.strip()
+            and "  " not in text and not _HAS_CTRL.search(text)):
+        return text
+    
+    # Remove null bytes and control characters (ASCII 0-31 except tab)
+    sanitized = text.translate(_CTRL_DELETE)
     
     # Strip whitespace
     sanitized = sanitized.strip()
     
     # Collapse multiple spaces into one
-    sanitized = re.sub(r' +', ' ', sanitized)
+    sanitized = _MULTI_SPACE.sub(' ', sanitized)
     
     # Limit length
     if len(sanitized) > max_length:
@@ -46,57 +89,311 @@ def sanitize_input(text: str, max_length: int) -> str:
     return sanitized
 
 
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to a raw file descriptor."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _list_number(name: str) -> int:
+    """Return N for an auto-generated "List N" name, or 0 for any other name."""
+    if name.startswith("List "):
+        try:
+            return int(name[5:])
+        except ValueError:
+            pass
+    return 0
+
+
 class Storage:
-    """Handles reading and writing to-do data to JSON file."""
+    """Handles reading and writing to-do data to JSON file.
+    
+    Mutations are appended to a journal next to the JSON snapshot instead of
+    rewriting the whole file; the journal is replayed on load and folded back
+    into the snapshot by compact(). Journal records are buffered briefly and
+    handed to a single background I/O thread together, so flush() (or
+    close()) must be called before exit. Errors from background writes are
+    passed to on_io_error on the main loop, or re-raised there if unset.
+    """
     
     def __init__(self, data_dir: Optional[Path] = None):
         """Initialize storage with optional custom data directory."""
-        if data_dir is None:
-            # Use XDG data directory standard
-            xdg_data = os.environ.get("XDG_DATA_HOME", 
-                                       os.path.expanduser("~/.local/share"))
-            self.data_dir = Path(xdg_data) / "simple-todo"
-        else:
-            self.data_dir = data_dir
+        self.data_dir = data_dir or _DEFAULT_DATA_DIR
         
         self.data_file = self.data_dir / "data.json"
+        self.journal_file = self.data_dir / "journal.msgpack"
         self._ensure_data_dir()
         self._lists: list[TodoList] = []
+        self._lists_by_id: dict[str, TodoList] = {}
+        # Lowercased list names and the next "List N" number to try, kept up
+        # to date incrementally so naming a list doesn't rescan every list
+        self._name_index: set[str] = set()
+        self._next_auto_num = 1
+        self._journal_ops = 0
+        self._generation = 0
+        self._pending_records: list[bytes] = []
+        self._dirty = False
+        self._save_timer_source: Optional[int] = None
+        # Disk writes run here, off the GTK main thread; a single worker
+        # keeps them in submission order
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simple-todo-io")
+        self.on_io_error: Optional[Callable[[Exception], None]] = None
         self._load()
+        self._journal = self._open_journal()
+        
+        # Start each session from a fresh snapshot and an empty journal. A
+        # journal holding only a torn or corrupt record must be emptied too,
+        # or every later record would be appended behind it and never replay.
+        if self._journal_ops or os.fstat(self._journal.fileno()).st_size:
+            self.compact()
     
     def _ensure_data_dir(self) -> None:
         """Create data directory if it doesn't exist."""
         self.data_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
     
     def _load(self) -> None:
-        """Load data from JSON file."""
-        if not self.data_file.exists():
-            self._lists = []
+        """Load data from JSON file, then replay the journal on top of it."""
+        lists: list[TodoList] = []
+        if self.data_file.exists():
+            try:
+                with open(self.data_file, "rb") as f:
+                    snapshot = _DECODER.decode(f.read())
+                lists = snapshot.lists
+                self._generation = snapshot.generation
+            except (msgspec.DecodeError, IOError):
+                # If file is corrupted, start fresh
+                lists = []
+        
+        # Build every index in a single pass over the loaded lists; journal
+        # replay then keeps them current through the same helpers as the
+        # public mutators
+        self._lists = lists
+        self._lists_by_id = {}
+        self._name_index = set()
+        self._next_auto_num = 1
+        for lst in lists:
+            self._lists_by_id[lst.id] = lst
+            self._index_name(lst.name)
+        
+        self._replay_journal()
+    
+    def _open_journal(self):
+        """Open the journal for appending with owner-only permissions."""
+        fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        # Unbuffered: records are written straight to the descriptor
+        return os.fdopen(fd, "ab", buffering=0)
+    
+    def _replay_journal(self) -> None:
+        """Re-apply the mutations recorded since the last compaction."""
+        try:
+            with open(self.journal_file, "rb") as f:
+                data = memoryview(f.read())
+        except IOError:
+            return
+        
+        pos = 0
+        while pos + _OP_HEADER_SIZE <= len(data):
+            size = int.from_bytes(data[pos:pos + _OP_HEADER_SIZE], "big")
+            start = pos + _OP_HEADER_SIZE
+            end = start + size
+            if end > len(data):
+                # Torn record from an interrupted write; drop it
+                break
+            try:
+                self._apply_op(_OP_DECODER.decode(data[start:end]))
+            except (msgspec.DecodeError, AttributeError, KeyError, TypeError):
+                # Corrupted record; keep everything replayed so far
+                break
+            self._journal_ops += 1
+            pos = end
+    
+    def _apply_op(self, op: dict) -> None:
+        """Apply a single journal record to the in-memory lists.
+        
+        Records from before the loaded snapshot's generation are skipped.
+        They are left behind when a crash lands between writing data.json
+        and emptying the journal, and replaying them could undo newer
+        changes, e.g. revert a rename.
+        """
+        if op.get("gen", 0) < self._generation:
+            return
+        kind = op["op"]
+        if kind == "create_list":
+            if self.get_list(op["list"]) is None:
+                self._add_list(TodoList(id=op["list"], name=op["name"]))
+            return
+        
+        lst = self.get_list(op["list"])
+        if not lst:
+            return
+        if kind == "delete_list":
+            self._remove_list(lst)
+        elif kind == "rename_list":
+            self._set_list_name(lst, op["name"])
+        elif kind == "add_task":
+            task = msgspec.convert(op["task"], Task)
+            if lst.get_task(task.id) is None:
+                lst.append_task(task)
+        elif kind == "delete_task":
+            lst.remove_task(op["task"])
+        else:
+            task = lst.get_task(op["task"])
+            if not task:
+                return
+            if kind == "update_task":
+                task.title = op["title"]
+            elif kind == "toggle_task":
+                task.completed = op["completed"]
+                lst.invalidate_counts()
+    
+    def _append_op(self, op: dict) -> None:
+        """Queue a mutation record for the journal."""
+        op["gen"] = self._generation
+        record = _OP_ENCODER.encode(op)
+        self._pending_records.append(len(record).to_bytes(_OP_HEADER_SIZE, "big") + record)
+        self._journal_ops += 1
+        self._mark_dirty()
+    
+    def _mark_dirty(self) -> None:
+        """Schedule a deferred write if one isn't already pending."""
+        self._dirty = True
+        if self._save_timer_source is None:
+            self._save_timer_source = GLib.timeout_add(SAVE_DELAY_MS, self._flush_if_dirty)
+    
+    def _flush_if_dirty(self) -> bool:
+        """Timer callback: write out queued records, compacting if needed."""
+        self._save_timer_source = None
+        if self._dirty:
+            if self._journal_ops >= JOURNAL_COMPACT_THRESHOLD:
+                self.compact(wait=False)
+            else:
+                self._write_pending()
+        return GLib.SOURCE_REMOVE
+    
+    def _write_pending(self) -> None:
+        """Append all queued records to the journal in a single write."""
+        if self._pending_records:
+            # write() may be short; a partial record would end replay early
+            self._submit_io(_write_all, self._journal.fileno(), b"".join(self._pending_records))
+            self._pending_records.clear()
+        self._dirty = False
+    
+    def _submit_io(self, fn, *args) -> Future:
+        """Run a disk write on the I/O thread, reporting failures on the main loop."""
+        future = self._io_executor.submit(fn, *args)
+        future.add_done_callback(self._on_io_done)
+        return future
+    
+    def _on_io_done(self, future: Future) -> None:
+        """I/O thread callback: hand any write error back to the main loop."""
+        if future.exception() is not None:
+            GLib.idle_add(self._report_io_error, future)
+    
+    def _report_io_error(self, future: Future) -> bool:
+        """Report a failed background write on the main loop."""
+        if self.on_io_error is None:
+            future.result()
+        else:
+            self.on_io_error(future.exception())
+        return GLib.SOURCE_REMOVE
+    
+    def _cancel_save_timer(self) -> None:
+        """Remove the pending deferred-write timer, if any."""
+        if self._save_timer_source is not None:
+            GLib.source_remove(self._save_timer_source)
+            self._save_timer_source = None
+    
+    def flush(self) -> None:
+        """Write any queued changes to disk immediately."""
+        self._cancel_save_timer()
+        if self._journal_ops:
+            self.compact()
+    
+    def compact(self, wait: bool = True) -> Future:
+        """Write a full snapshot to data.json and empty the journal.
+        
+        The snapshot is encoded here, on the caller's thread, and written
+        by the I/O thread. flush() and startup wait for the write to finish;
+        routine compactions run in the background. Either way a failed
+        write is only reported through the main loop, never raised here,
+        and the journal is kept so the next flush() compacts again.
+        """
+        # The snapshot already reflects any records still queued in memory
+        self._generation += 1
+        data = _ENCODER.encode(DataFile(lists=self._lists, generation=self._generation))
+        records = b"".join(self._pending_records)
+        self._pending_records.clear()
+        self._dirty = False
+        ops, self._journal_ops = self._journal_ops, 0
+        future = self._submit_io(self._write_snapshot, data, records)
+        future.add_done_callback(partial(self._on_compact_done, ops))
+        if wait:
+            wait_for([future])
+        return future
+    
+    def _on_compact_done(self, ops: int, future: Future) -> None:
+        """I/O thread callback: after a failed snapshot, count its ops again."""
+        if future.exception() is not None:
+            GLib.idle_add(self._restore_journal_ops, ops)
+    
+    def _restore_journal_ops(self, ops: int) -> bool:
+        """Re-count journaled ops that a failed compaction did not fold in."""
+        self._journal_ops += ops
+        return GLib.SOURCE_REMOVE
+    
+    def close(self) -> None:
+        """Flush pending changes and close the journal.
+        
+        The main loop has stopped by now, so a failed final write is raised
+        here instead of being passed to on_io_error.
+        """
+        if self._journal.closed:
             return
+        self._cancel_save_timer()
+        future = self.compact(wait=False) if self._journal_ops else None
+        self._io_executor.shutdown(wait=True)
+        self._journal.close()
+        if future is not None:
+            future.result()
+    
+    def _write_snapshot(self, data: bytes, records: bytes) -> None:
+        """I/O thread: replace data.json with data, then empty the journal.
         
+        records are the journal records still queued when the snapshot was
+        taken. If the snapshot can't be written they are appended to the
+        journal instead, so no change depends on the failed write.
+        """
         try:
-            with open(self.data_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self._lists = [TodoList.from_dict(lst) for lst in data.get("lists", [])]
-        except (json.JSONDecodeError, IOError):
-            # If file is corrupted, start fresh
-            self._lists = []
-    
-    def _save(self) -> None:
-        """Save data to JSON file with atomic write."""
-        data = {
-            "lists": [lst.to_dict() for lst in self._lists]
-        }
+            self._save(data)
+        except Exception:
+            if records:
+                _write_all(self._journal.fileno(), records)
+            raise
+        self._journal.truncate(0)
+    
+    def _save(self, data: bytes) -> None:
+        """Save encoded data to the JSON file atomically."""
+        self._ensure_data_dir()
         
         # Atomic write: write to temp file, then rename
         # This prevents data corruption if write is interrupted
-        self._ensure_data_dir()
+        if hasattr(os, "O_TMPFILE"):
+            try:
+                self._save_via_tmpfile(data)
+                return
+            except OSError:
+                # Filesystem (or /proc) doesn't support it; use a named temp file
+                pass
+        
         fd, temp_path = tempfile.mkstemp(dir=self.data_dir, suffix=".tmp")
         try:
-            # Set restrictive permissions (owner read/write only)
-            os.fchmod(fd, 0o600)
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            try:
+                # Set restrictive permissions (owner read/write only)
+                os.fchmod(fd, 0o600)
+                _write_all(fd, data)
+            finally:
+                os.close(fd)
             os.replace(temp_path, self.data_file)
         except Exception:
             # Clean up temp file on failure
@@ -104,45 +401,65 @@ class Storage:
                 os.unlink(temp_path)
             raise
     
-    def get_lists(self) -> list[TodoList]:
-        """Return all to-do lists."""
-        return self._lists.copy()
+    def _save_via_tmpfile(self, data: bytes) -> None:
+        """Atomically replace data.json using an anonymous O_TMPFILE inode.
+        
+        Linux only. The contents are written to an unnamed file in the data
+        directory, which is only linked into the directory once complete and
+        then renamed over data.json. This skips mkstemp's random-name search.
+        """
+        temp_path = self.data_dir / "data.json.tmp"
+        fd = os.open(self.data_dir, os.O_TMPFILE | os.O_WRONLY, 0o600)
+        try:
+            _write_all(fd, data)
+            # Clear a leftover link from an interrupted save
+            if os.path.lexists(temp_path):
+                os.unlink(temp_path)
+            os.link(f"/proc/self/fd/{fd}", temp_path, follow_symlinks=True)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, self.data_file)
+    
+    def get_lists(self) -> tuple[TodoList, ...]:
+        """Return all to-do lists as an immutable snapshot."""
+        return tuple(self._lists)
     
     def get_list(self, list_id: str) -> Optional[TodoList]:
         """Get a specific list by ID."""
-        for lst in self._lists:
-            if lst.id == list_id:
-                return lst
-        return None
+        return self._lists_by_id.get(list_id)
     
-    def _get_existing_names(self) -> set[str]:
-        """Return a set of all existing list names (lowercase for comparison)."""
-        return {lst.name.lower() for lst in self._lists}
+    def _index_name(self, name: str) -> None:
+        """Record a list name in the name index."""
+        self._name_index.add(name.lower())
+        self._next_auto_num = max(self._next_auto_num, _list_number(name) + 1)
     
-    def _get_next_list_number(self) -> int:
-        """Find the next available number for auto-naming.
-        
-        Looks at all existing "List N" names and returns max(N) + 1.
-        """
-        max_num = 0
-        for lst in self._lists:
-            if lst.name.startswith("List "):
-                try:
-                    num = int(lst.name[5:])
-                    max_num = max(max_num, num)
-                except ValueError:
-                    pass
-        return max_num + 1
+    def _add_list(self, lst: TodoList) -> None:
+        """Append a list and record it in the indexes."""
+        self._lists.append(lst)
+        self._lists_by_id[lst.id] = lst
+        self._index_name(lst.name)
+    
+    def _remove_list(self, lst: TodoList) -> None:
+        """Remove a list and drop it from the indexes."""
+        self._lists.remove(lst)
+        del self._lists_by_id[lst.id]
+        self._name_index.discard(lst.name.lower())
+    
+    def _set_list_name(self, lst: TodoList, name: str) -> None:
+        """Rename a list and update the name index."""
+        self._name_index.discard(lst.name.lower())
+        lst.name = name
+        self._index_name(name)
     
     def _generate_unique_name(self) -> str:
         """Generate a unique auto-name for a new list."""
-        existing_names = self._get_existing_names()
-        num = self._get_next_list_number()
+        num = self._next_auto_num
         
         # Keep incrementing until we find a unique name
-        while f"list {num}".lower() in existing_names:
+        while f"list {num}" in self._name_index:
             num += 1
         
+        self._next_auto_num = num + 1
         return f"List {num}"
     
     def create_list(self, name: Optional[str] = None) -> TodoList:
@@ -155,7 +472,7 @@ class Storage:
             name = sanitize_input(name, MAX_LIST_NAME_LENGTH)
             
             # Ensure uniqueness (case-insensitive)
-            existing_names = self._get_existing_names()
+            existing_names = self._name_index
             if name.lower() in existing_names:
                 # Append a number to make it unique
                 base_name = name
@@ -170,18 +487,18 @@ class Storage:
                     name = base_name[:MAX_LIST_NAME_LENGTH - len(suffix)] + suffix
         
         new_list = TodoList(name=name)
-        self._lists.append(new_list)
-        self._save()
+        self._add_list(new_list)
+        self._append_op({"op": "create_list", "list": new_list.id, "name": name})
         return new_list
     
     def delete_list(self, list_id: str) -> bool:
         """Delete a list by ID. Returns True if found and deleted."""
-        for i, lst in enumerate(self._lists):
-            if lst.id == list_id:
-                del self._lists[i]
-                self._save()
-                return True
-        return False
+        lst = self.get_list(list_id)
+        if lst is None:
+            return False
+        self._remove_list(lst)
+        self._append_op({"op": "delete_list", "list": list_id})
+        return True
     
     def rename_list(self, list_id: str, new_name: str) -> bool:
         """Rename a list. Returns True if found and renamed."""
@@ -193,14 +510,15 @@ class Storage:
         new_name = sanitize_input(new_name, MAX_LIST_NAME_LENGTH)
         if not new_name:
             return False
+        if new_name == lst.name:
+            return True  # Unchanged; nothing to write
         
         # Check for uniqueness (excluding the current list)
-        existing_names = {l.name.lower() for l in self._lists if l.id != list_id}
-        if new_name.lower() in existing_names:
+        if new_name.lower() != lst.name.lower() and new_name.lower() in self._name_index:
             return False  # Name already taken
         
-        lst.name = new_name
-        self._save()
+        self._set_list_name(lst, new_name)
+        self._append_op({"op": "rename_list", "list": list_id, "name": new_name})
         return True
     
     def add_task(self, list_id: str, title: str) -> Optional[Task]:
@@ -215,7 +533,7 @@ class Storage:
             return None
         
         task = lst.add_task(title)
-        self._save()
+        self._append_op({"op": "add_task", "list": list_id, "task": task})
         return task
     
     def update_task(self, list_id: str, task_id: str, title: str) -> bool:
@@ -232,16 +550,18 @@ class Storage:
         title = sanitize_input(title, MAX_TASK_TITLE_LENGTH)
         if not title:
             return False
+        if title == task.title:
+            return True  # Unchanged; nothing to write
         
         task.title = title
-        self._save()
+        self._append_op({"op": "update_task", "list": list_id, "task": task_id, "title": title})
         return True
     
     def delete_task(self, list_id: str, task_id: str) -> bool:
         """Delete a task from a list. Returns True if successful."""
         lst = self.get_list(list_id)
         if lst and lst.remove_task(task_id):
-            self._save()
+            self._append_op({"op": "delete_task", "list": list_id, "task": task_id})
             return True
         return False
     
@@ -252,7 +572,9 @@ class Storage:
             task = lst.get_task(task_id)
             if task:
                 task.completed = not task.completed
-                self._save()
+                lst.invalidate_counts()
+                self._append_op({"op": "toggle_task", "list": list_id, "task": task_id,
+                                 "completed": task.completed})
                 return True
         return False
 
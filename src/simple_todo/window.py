@@ -1,23 +1,159 @@
 """Main window for the Simple Todo List application."""
 
+import weakref
+
 import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw, GLib, Pango
+from gi.repository import Gtk, Adw, Gdk, Gio, GLib, GObject, Gsk, Pango
 
 from .storage import Storage
 from .models import TodoList, Task
 
+# Shared by every completed task label rather than rebuilt per row
+_STRIKETHROUGH_ATTRS = Pango.AttrList()
+_STRIKETHROUGH_ATTRS.insert(Pango.attr_strikethrough_new(True))
+
+_CSS = """
+    .badge {
+        background-color: @accent_bg_color;
+        color: @accent_fg_color;
+        border-radius: 10px;
+        padding: 2px 8px;
+        font-size: 0.85em;
+        font-weight: bold;
+    }
+    .task-section-header {
+        font-weight: bold;
+        font-size: 0.9em;
+        color: @dim_color;
+        padding: 8px 12px;
+    }
+    .completed-section {
+        opacity: 0.7;
+    }
+    .sidebar-container {
+        border-right: 1px solid @borders;
+    }
+    .compact-button {
+        min-height: 0;
+        min-width: 0;
+        padding: 2px;
+        margin: 0;
+    }
+"""
+
+# Added on top of _CSS where windows render with cairo, whether forced or
+# fallen back to without GL: rounded clips are expensive in software
+_CAIRO_CSS = """
+    .badge, .sidebar-container {
+        border-radius: 0;
+        box-shadow: none;
+        transition: none;
+    }
+"""
+
+
+class TaskItem(GObject.Object):
+    """List model item wrapping a Task.
+    
+    Exposes the task's title as a property so its row can bind to it;
+    call notify("title") after editing the task.
+    """
+    
+    __gtype_name__ = "SimpleTodoTaskItem"
+    
+    def __init__(self, task: Task):
+        super().__init__()
+        self.task = task
+    
+    @GObject.Property(type=str)
+    def title(self) -> str:
+        """The task's title."""
+        return self.task.title
+
+
+class TaskSectionItem(GObject.Object):
+    """List model item standing for a "To Do" or "Completed" heading.
+    
+    Only used on GTK < 4.12, where the task list view has no header
+    factory and the headings are rows of their own.
+    """
+    
+    __gtype_name__ = "SimpleTodoTaskSectionItem"
+    
+    def __init__(self, completed: bool):
+        super().__init__()
+        self.completed = completed
+
+
+class TodoListItem(GObject.Object):
+    """List model item wrapping a TodoList.
+    
+    Exposes the list's name and task counts as properties so sidebar rows
+    can bind to them; call notify("name") after a rename and
+    counts_changed() after adding, toggling or deleting tasks.
+    """
+    
+    __gtype_name__ = "SimpleTodoListItem"
+    
+    def __init__(self, todo_list: TodoList):
+        super().__init__()
+        self.todo_list = todo_list
+        self._notified_counts = todo_list.counts
+        self._had_tasks = bool(todo_list.tasks)
+    
+    @GObject.Property(type=str)
+    def name(self) -> str:
+        """The list's name."""
+        return self.todo_list.name
+    
+    @GObject.Property(type=str)
+    def count_text(self) -> str:
+        """Badge text in completed/total format."""
+        completed, total = self.todo_list.counts
+        return f"{completed}/{total}"
+    
+    @GObject.Property(type=bool, default=False)
+    def has_tasks(self) -> bool:
+        """Whether the list has any tasks; the badge is hidden otherwise."""
+        return bool(self.todo_list.tasks)
+    
+    def counts_changed(self):
+        """Notify bound widgets that the task counts changed.
+        
+        Nothing is emitted if the counts match the last notification, e.g.
+        after a task was toggled twice in one refresh. The badge only needs
+        to appear or disappear when the list goes between empty and
+        non-empty; otherwise just its text changes.
+        """
+        counts = self.todo_list.counts
+        if counts == self._notified_counts:
+            return
+        self._notified_counts = counts
+        self.notify("count_text")
+        has_tasks = bool(self.todo_list.tasks)
+        if has_tasks != self._had_tasks:
+            self._had_tasks = has_tasks
+            self.notify("has_tasks")
+
 
 class TaskRow(Gtk.Box):
-    """A row widget representing a single task."""
+    """A row widget representing a single task.
+    
+    Rows are created by the task list view's factory and re-bound to
+    whichever task scrolls into view, so they hold no task until bind().
+    Edit and delete live in a popover shared by all rows, which the
+    window opens from a single gesture on the list view.
+    """
     
-    def __init__(self, task: Task, on_toggle, on_edit, on_delete):
+    def __init__(self, on_toggle):
         super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-        self.task = task
-        self.on_toggle = on_toggle
-        self.on_edit = on_edit
-        self.on_delete = on_delete
+        self.task: Task | None = None
+        # Weak, so rows never keep the window alive
+        self.on_toggle = weakref.WeakMethod(on_toggle)
+        self._shows_completed = False
+        self._title_binding: GObject.Binding | None = None
         
         self.set_margin_start(8)
         self.set_margin_end(8)
@@ -26,100 +162,136 @@ class TaskRow(Gtk.Box):
         
         # Checkbox
         self.check = Gtk.CheckButton()
-        self.check.set_active(task.completed)
-        self.check.connect("toggled", self._on_check_toggled)
+        self._toggled_handler = self.check.connect("toggled", self._on_check_toggled)
         self.append(self.check)
         
         # Task label
-        self.label = Gtk.Label(label=task.title)
+        self.label = Gtk.Label()
         self.label.set_hexpand(True)
         self.label.set_halign(Gtk.Align.START)
         self.label.set_ellipsize(Pango.EllipsizeMode.END)
-        if task.completed:
-            self.label.add_css_class("dim-label")
-            attrs = Pango.AttrList()
-            attrs.insert(Pango.attr_strikethrough_new(True))
-            self.label.set_attributes(attrs)
         self.append(self.label)
-        
-        # Edit button
-        edit_btn = Gtk.Button(icon_name="document-edit-symbolic")
-        edit_btn.add_css_class("flat")
-        edit_btn.set_tooltip_text("Edit task")
-        edit_btn.connect("clicked", self._on_edit_clicked)
-        self.append(edit_btn)
-        
-        # Delete button
-        delete_btn = Gtk.Button(icon_name="user-trash-symbolic")
-        delete_btn.add_css_class("flat")
-        delete_btn.add_css_class("destructive-action")
-        delete_btn.set_tooltip_text("Delete task")
-        delete_btn.connect("clicked", self._on_delete_clicked)
-        self.append(delete_btn)
     
-    def _on_check_toggled(self, check):
-        self.on_toggle(self.task.id)
+    def bind(self, item: TaskItem):
+        """Show the given task in this row."""
+        task = self.task = item.task
+        # Sync the checkbox without reporting it as a user toggle
+        with self.check.handler_block(self._toggled_handler):
+            self.check.set_active(task.completed)
+        # The title follows the item until unbind()
+        self._title_binding = item.bind_property(
+            "title", self.label, "label", GObject.BindingFlags.SYNC_CREATE
+        )
+        # Recycled rows usually stay in their section; only restyle on change
+        if task.completed == self._shows_completed:
+            return
+        self._shows_completed = task.completed
+        if task.completed:
+            self.add_css_class("completed-section")
+            self.label.add_css_class("dim-label")
+            self.label.set_attributes(_STRIKETHROUGH_ATTRS)
+        else:
+            self.remove_css_class("completed-section")
+            self.label.remove_css_class("dim-label")
+            self.label.set_attributes(None)
     
-    def _on_edit_clicked(self, btn):
-        self.on_edit(self.task)
+    def unbind(self):
+        """Detach the row from its task."""
+        if self._title_binding is not None:
+            self._title_binding.unbind()
+            self._title_binding = None
+        self.task = None
     
-    def _on_delete_clicked(self, btn):
-        self.on_delete(self.task.id)
+    def _on_check_toggled(self, check):
+        on_toggle = self.on_toggle()
+        if self.task and on_toggle:
+            on_toggle(self.task.id)
 
 
-class ListRow(Gtk.Box):
-    """A row widget representing a to-do list in the sidebar."""
+class ListRow(Gtk.Grid):
+    """A row widget representing a to-do list in the sidebar.
     
-    def __init__(self, todo_list: TodoList, on_edit_list):
-        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-        self.todo_list = todo_list
-        self.on_edit_list = on_edit_list
+    Like TaskRow, rows are recycled by the sidebar list view and re-bound
+    to a list with bind(). The name, badge and edit button sit in a single
+    grid rather than nested boxes.
+    """
+    
+    def __init__(self, on_edit_list):
+        super().__init__(column_spacing=4)
+        self.todo_list: TodoList | None = None
+        self.on_edit_list = weakref.WeakMethod(on_edit_list)  # See TaskRow
+        self._bindings: list[GObject.Binding] = []
         
         self.set_margin_start(8)
         self.set_margin_end(4)
         self.set_margin_top(6)
         self.set_margin_bottom(6)
         
-        # List name label - wrap text but not too aggressively
-        self.label = Gtk.Label(label=todo_list.name)
+        # List name on one line, ellipsized if it doesn't fit. On GTK 4.8+ an
+        # Inscription sizes itself from character counts instead of laying
+        # out the text on every measure.
+        if hasattr(Gtk, "Inscription"):
+            self.label = Gtk.Inscription()
+            self.label.set_nat_chars(12)
+            self.label.set_text_overflow(Gtk.InscriptionOverflow.ELLIPSIZE_END)
+            self._label_property = "text"
+        else:
+            self.label = Gtk.Label()
+            self.label.set_ellipsize(Pango.EllipsizeMode.END)
+            self._label_property = "label"
+        self.label.set_xalign(0)  # Left align text
         self.label.set_hexpand(True)
         self.label.set_halign(Gtk.Align.FILL)
-        self.label.set_wrap(True)
-        self.label.set_wrap_mode(Pango.WrapMode.WORD_CHAR)
-        self.label.set_xalign(0)  # Left align text
-        self.label.set_natural_wrap_mode(Gtk.NaturalWrapMode.NONE)
-        self.append(self.label)
+        self.label.set_valign(Gtk.Align.CENTER)
+        self.attach(self.label, 0, 0, 1, 1)
+        
+        # Task count badge (completed/total format), hidden for empty lists
+        self.count_label = Gtk.Label()
+        self.count_label.add_css_class("badge")
+        self.count_label.set_valign(Gtk.Align.CENTER)
+        self.attach(self.count_label, 1, 0, 1, 1)
         
-        # Right side container for badge and edit button (minimal width)
-        right_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=4)
-        right_box.set_valign(Gtk.Align.CENTER)
-        right_box.set_halign(Gtk.Align.END)
-        
-        # Task count badge (completed/total format)
-        completed = len(todo_list.get_completed_tasks())
-        total = len(todo_list.tasks)
-        if total > 0:
-            self.count_label = Gtk.Label(label=f"{completed}/{total}")
-            self.count_label.add_css_class("badge")
-            right_box.append(self.count_label)
-        
-        # Edit button (hidden by default, shown when selected)
-        self.edit_btn = Gtk.Button(icon_name="document-edit-symbolic")
-        self.edit_btn.add_css_class("flat")
-        self.edit_btn.add_css_class("compact-button")
-        self.edit_btn.set_tooltip_text("Edit list")
-        self.edit_btn.set_visible(False)
-        self.edit_btn.connect("clicked", self._on_edit_clicked)
-        right_box.append(self.edit_btn)
-        
-        self.append(right_box)
+        # Edit button, shown only on the selected row and so only built
+        # once a row is first selected
+        self.edit_btn: Gtk.Button | None = None
+    
+    def bind(self, item: TodoListItem):
+        """Show the given list in this row."""
+        self.todo_list = item.todo_list
+        
+        # The name and badge follow the item until unbind()
+        flags = GObject.BindingFlags.SYNC_CREATE
+        self._bindings = [
+            item.bind_property("name", self.label, self._label_property, flags),
+            item.bind_property("count_text", self.count_label, "label", flags),
+            item.bind_property("has_tasks", self.count_label, "visible", flags),
+        ]
+    
+    def unbind(self):
+        """Detach the row from its list."""
+        for binding in self._bindings:
+            binding.unbind()
+        self._bindings = []
+        self.todo_list = None
     
     def set_selected(self, selected: bool):
         """Show or hide the edit button based on selection state."""
+        if self.edit_btn is None:
+            if not selected:
+                return
+            self.edit_btn = Gtk.Button(icon_name="document-edit-symbolic")
+            self.edit_btn.add_css_class("flat")
+            self.edit_btn.add_css_class("compact-button")
+            self.edit_btn.set_tooltip_text("Edit list")
+            self.edit_btn.set_valign(Gtk.Align.CENTER)
+            self.edit_btn.connect("clicked", self._on_edit_clicked)
+            self.attach(self.edit_btn, 2, 0, 1, 1)
         self.edit_btn.set_visible(selected)
     
     def _on_edit_clicked(self, btn):
-        self.on_edit_list(self.todo_list)
+        on_edit_list = self.on_edit_list()
+        if self.todo_list and on_edit_list:
+            on_edit_list(self.todo_list)
 
 
 class MainWindow(Adw.ApplicationWindow):
@@ -127,61 +299,85 @@ class MainWindow(Adw.ApplicationWindow):
     
     SIDEBAR_WIDTH = 175
     
+    # Shared by every window: each stylesheet is parsed once per process and
+    # registered once per display
+    _css_providers: dict[str, Gtk.CssProvider] = {}
+    _css_displays: set = set()
+    
     def __init__(self, app):
         super().__init__(application=app)
-        self.storage = Storage()
+        self.storage: Storage = app.storage
+        self.storage.on_io_error = self._on_storage_error
         self.current_list: TodoList | None = None
         self.sidebar_expanded = True
+        self._updating_lists = False
+        self._task_items_by_id: dict[str, TaskItem] = {}
+        self._tasks_list: TodoList | None = None  # List shown in the task stores
+        self._list_position_by_id: dict[str, int] = {}
+        # Python-side mirror of lists_model, so lookups never walk the model
+        self._list_items: list[TodoListItem] = []
+        self._list_items_by_id: dict[str, TodoListItem] = {}
+        self._pending_refresh: set[str] = set()
+        self._refresh_source: int | None = None
+        self._dialogs: dict[str, Adw.MessageDialog] = {}
+        self._task_popover: Gtk.Popover | None = None
+        self._popover_task: Task | None = None
         
         self.set_title("Simple Todo List")
         self.set_default_size(800, 600)
         
         self._build_ui()
         self._load_lists()
+        # Keep CSS parsing off the path to constructing the window
+        self._map_handler = self.connect("map", self._on_first_map)
+    
+    def _on_first_map(self, window):
+        self.disconnect(self._map_handler)
         self._apply_css()
     
+    @classmethod
+    def _get_css_provider(cls, css: str) -> Gtk.CssProvider:
+        """Return the provider for a stylesheet, parsing it on first use."""
+        provider = cls._css_providers.get(css)
+        if provider is None:
+            provider = cls._css_providers[css] = Gtk.CssProvider()
+            if hasattr(provider, "load_from_string"):  # GTK 4.12+
+                provider.load_from_string(css)
+            else:
+                provider.load_from_data(css.encode())
+        return provider
+    
     def _apply_css(self):
         """Apply custom CSS styles."""
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(b"""
-            .badge {
-                background-color: @accent_bg_color;
-                color: @accent_fg_color;
-                border-radius: 10px;
-                padding: 2px 8px;
-                font-size: 0.85em;
-                font-weight: bold;
-            }
-            .task-section-header {
-                font-weight: bold;
-                font-size: 0.9em;
-                color: @dim_color;
-                padding: 8px 12px;
-            }
-            .completed-section {
-                opacity: 0.7;
-            }
-            .sidebar-container {
-                border-right: 1px solid @borders;
-            }
-            .compact-button {
-                min-height: 0;
-                min-width: 0;
-                padding: 2px;
-                margin: 0;
-            }
-        """)
+        display = self.get_display()
+        if display in self._css_displays:
+            return
         Gtk.StyleContext.add_provider_for_display(
-            self.get_display(),
-            css_provider,
+            display,
+            self._get_css_provider(_CSS),
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
+        # The window is mapped, so its renderer is the one GTK settled on
+        if isinstance(self.get_renderer(), Gsk.CairoRenderer):
+            Gtk.StyleContext.add_provider_for_display(
+                display,
+                self._get_css_provider(_CAIRO_CSS),
+                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 1
+            )
+        self._css_displays.add(display)
+        # A classmethod, so the display doesn't keep this window alive
+        display.connect("closed", self._forget_css_display)
+    
+    @classmethod
+    def _forget_css_display(cls, display, is_error):
+        cls._css_displays.discard(display)
     
     def _build_ui(self):
         """Build the main UI layout."""
-        # Main layout
-        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        self.set_content(main_box)
+        # Main layout: header bar above the sidebar/content panes, in a grid
+        # with fixed cells rather than a box distributing free space
+        main_grid = Gtk.Grid()
+        self.set_content(main_grid)
         
         # Header bar
         header = Adw.HeaderBar()
@@ -199,14 +395,15 @@ class MainWindow(Adw.ApplicationWindow):
         new_list_btn.connect("clicked", self._on_new_list)
         header.pack_start(new_list_btn)
         
-        main_box.append(header)
+        main_grid.attach(header, 0, 0, 1, 1)
         
         # Paned container for sidebar and content (draggable divider)
         self.paned = Gtk.Paned(orientation=Gtk.Orientation.HORIZONTAL)
+        self.paned.set_hexpand(True)
         self.paned.set_vexpand(True)
         self.paned.set_shrink_start_child(False)  # Prevent sidebar from completely shrinking
         self.paned.set_shrink_end_child(False)    # Prevent content from completely shrinking
-        main_box.append(self.paned)
+        main_grid.attach(self.paned, 0, 1, 1, 1)
         
         # Left sidebar for lists
         self.sidebar_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -215,30 +412,34 @@ class MainWindow(Adw.ApplicationWindow):
         self.sidebar_box.add_css_class("sidebar-container")
         
         # Lists header
-        lists_header = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
-        lists_header.set_margin_start(12)
-        lists_header.set_margin_end(12)
-        lists_header.set_margin_top(12)
-        lists_header.set_margin_bottom(8)
-        
         lists_label = Gtk.Label(label="Lists")
-        lists_label.set_hexpand(True)
+        lists_label.set_margin_start(12)
+        lists_label.set_margin_end(12)
+        lists_label.set_margin_top(12)
+        lists_label.set_margin_bottom(8)
         lists_label.set_halign(Gtk.Align.START)
         lists_label.add_css_class("heading")
-        lists_header.append(lists_label)
-        
-        self.sidebar_box.append(lists_header)
+        self.sidebar_box.append(lists_label)
         
         # Scrollable list of lists
         scroll_lists = Gtk.ScrolledWindow()
         scroll_lists.set_vexpand(True)
         scroll_lists.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         
-        self.lists_box = Gtk.ListBox()
-        self.lists_box.set_selection_mode(Gtk.SelectionMode.SINGLE)
-        self.lists_box.add_css_class("navigation-sidebar")
-        self.lists_box.connect("row-selected", self._on_list_selected)
-        scroll_lists.set_child(self.lists_box)
+        self.lists_model = Gio.ListStore(item_type=TodoListItem)
+        self.lists_selection = Gtk.SingleSelection(model=self.lists_model)
+        self.lists_selection.set_autoselect(False)
+        self.lists_selection.set_can_unselect(True)
+        self.lists_selection.connect("notify::selected-item", self._on_list_selected)
+        
+        lists_factory = Gtk.SignalListItemFactory()
+        lists_factory.connect("setup", self._on_list_row_setup)
+        lists_factory.connect("bind", self._on_list_row_bind)
+        lists_factory.connect("unbind", self._on_list_row_unbind)
+        
+        self.lists_view = Gtk.ListView(model=self.lists_selection, factory=lists_factory)
+        self.lists_view.add_css_class("navigation-sidebar")
+        scroll_lists.set_child(self.lists_view)
         
         self.sidebar_box.append(scroll_lists)
         self.paned.set_start_child(self.sidebar_box)
@@ -281,8 +482,54 @@ class MainWindow(Adw.ApplicationWindow):
         scroll_tasks.set_vexpand(True)
         scroll_tasks.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         
-        self.tasks_container = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        scroll_tasks.set_child(self.tasks_container)
+        # Pending and completed tasks live in separate stores, shown one
+        # after the other as sections of a single virtualized list
+        self.pending_store = Gio.ListStore(item_type=TaskItem)
+        self.completed_store = Gio.ListStore(item_type=TaskItem)
+        sections = Gio.ListStore(item_type=Gio.ListStore)
+        has_header_factory = hasattr(Gtk.ListView, "set_header_factory")  # GTK 4.12+
+        for store in (self.pending_store, self.completed_store):
+            if not has_header_factory:
+                # Precede the section with a heading item while it has tasks
+                heading_store = Gio.ListStore(item_type=TaskSectionItem)
+                heading = TaskSectionItem(store is self.completed_store)
+                store.connect("items-changed", self._on_task_section_changed,
+                              heading_store, heading)
+                sections.append(heading_store)
+            sections.append(store)
+        tasks_model = Gtk.FlattenListModel(model=sections)
+        
+        tasks_factory = Gtk.SignalListItemFactory()
+        tasks_factory.connect("setup", self._on_task_row_setup)
+        tasks_factory.connect("bind", self._on_task_row_bind)
+        tasks_factory.connect("unbind", self._on_task_row_unbind)
+        
+        self.tasks_view = Gtk.ListView(
+            model=Gtk.NoSelection(model=tasks_model),
+            factory=tasks_factory
+        )
+        
+        # One context-menu gesture pair for the whole list rather than per
+        # row; the row under the pointer is found with pick()
+        menu_click = Gtk.GestureClick(button=Gdk.BUTTON_SECONDARY)
+        menu_click.connect("pressed", lambda gesture, n_press, x, y: self._on_task_menu_requested(x, y))
+        self.tasks_view.add_controller(menu_click)
+        menu_long_press = Gtk.GestureLongPress()
+        menu_long_press.connect("pressed", lambda gesture, x, y: self._on_task_menu_requested(x, y))
+        self.tasks_view.add_controller(menu_long_press)
+        # Keyboard equivalent for the focused row
+        menu_shortcut = Gtk.ShortcutController()
+        menu_shortcut.add_shortcut(Gtk.Shortcut(
+            trigger=Gtk.ShortcutTrigger.parse_string("Menu|<Shift>F10"),
+            action=Gtk.CallbackAction.new(self._on_task_menu_key)
+        ))
+        self.tasks_view.add_controller(menu_shortcut)
+        if has_header_factory:
+            header_factory = Gtk.SignalListItemFactory()
+            header_factory.connect("setup", self._on_task_header_setup)
+            header_factory.connect("bind", self._on_task_header_bind)
+            self.tasks_view.set_header_factory(header_factory)
+        scroll_tasks.set_child(self.tasks_view)
         
         content_box.append(scroll_tasks)
         
@@ -325,163 +572,346 @@ class MainWindow(Adw.ApplicationWindow):
             self.active_list_label.set_label("")
             self.active_list_label.set_visible(False)
     
+    def _on_list_row_setup(self, factory, list_item):
+        row = ListRow(on_edit_list=self._on_edit_list)
+        list_item.set_child(row)
+        list_item.connect(
+            "notify::selected",
+            lambda item, pspec: row.set_selected(item.get_selected())
+        )
+    
+    def _on_list_row_bind(self, factory, list_item):
+        row = list_item.get_child()
+        row.bind(list_item.get_item())
+        row.set_selected(list_item.get_selected())
+    
+    def _on_list_row_unbind(self, factory, list_item):
+        list_item.get_child().unbind()
+    
+    def _on_task_row_setup(self, factory, list_item):
+        list_item.set_child(TaskRow(on_toggle=self._on_toggle_task))
+    
+    def _on_task_row_bind(self, factory, list_item):
+        item = list_item.get_item()
+        child = list_item.get_child()
+        # Heading items only exist without a header factory; the two rows
+        # that land on them swap their child for a heading label and back
+        if isinstance(item, TaskSectionItem):
+            if not isinstance(child, Gtk.Label):
+                child = self._build_task_heading()
+                list_item.set_child(child)
+            self._show_task_heading(child, item.completed)
+            return
+        if not isinstance(child, TaskRow):
+            child = TaskRow(on_toggle=self._on_toggle_task)
+            list_item.set_child(child)
+        child.bind(item)
+    
+    def _on_task_row_unbind(self, factory, list_item):
+        child = list_item.get_child()
+        if isinstance(child, TaskRow):
+            child.unbind()
+    
+    def _on_task_section_changed(self, store, position, removed, added,
+                                 heading_store, heading):
+        """Show a section's heading item only while the section has tasks."""
+        has_tasks = store.get_n_items() > 0
+        if has_tasks != (heading_store.get_n_items() > 0):
+            if has_tasks:
+                heading_store.append(heading)
+            else:
+                heading_store.remove_all()
+    
+    def _build_task_heading(self) -> Gtk.Label:
+        """Build a label for a "To Do" or "Completed" heading."""
+        label = Gtk.Label()
+        label.add_css_class("task-section-header")
+        label.set_halign(Gtk.Align.START)
+        return label
+    
+    def _show_task_heading(self, label: Gtk.Label, completed: bool):
+        """Show the heading of the completed or the pending section."""
+        if completed:
+            label.set_label("Completed")
+            label.set_margin_top(16)
+        else:
+            label.set_label("To Do")
+            label.set_margin_top(0)
+    
+    def _on_task_header_setup(self, factory, header):
+        header.set_child(self._build_task_heading())
+    
+    def _on_task_header_bind(self, factory, header):
+        completed = header.get_start() >= self.pending_store.get_n_items()
+        self._show_task_heading(header.get_child(), completed)
+    
     def _load_lists(self):
-        """Load all lists into the sidebar."""
-        # Remember current selection
-        current_id = self.current_list.id if self.current_list else None
-        
-        # Clear existing
-        while True:
-            row = self.lists_box.get_row_at_index(0)
-            if row is None:
-                break
-            self.lists_box.remove(row)
-        
-        # Add lists
+        """Load all lists into the sidebar and select the first one."""
         lists = self.storage.get_lists()
-        for todo_list in lists:
-            row = Gtk.ListBoxRow()
-            list_row = ListRow(todo_list, on_edit_list=self._on_edit_list)
-            row.set_child(list_row)
-            row.todo_list = todo_list
-            row.list_row_widget = list_row
-            self.lists_box.append(row)
-        
-        # Re-select previous list or first list
-        if lists:
-            selected = False
-            if current_id:
-                for i in range(len(lists)):
-                    row = self.lists_box.get_row_at_index(i)
-                    if row and row.todo_list.id == current_id:
-                        self.lists_box.select_row(row)
-                        selected = True
-                        break
-            
-            if not selected and self.current_list is None:
-                first_row = self.lists_box.get_row_at_index(0)
-                if first_row:
-                    self.lists_box.select_row(first_row)
+        self._list_items = [TodoListItem(todo_list) for todo_list in lists]
+        self._list_items_by_id = {item.todo_list.id: item for item in self._list_items}
+        self._list_position_by_id = {
+            todo_list.id: position for position, todo_list in enumerate(lists)
+        }
+        
+        # Fill the empty model in one go, without reacting to the transient
+        # selection
+        self._updating_lists = True
+        try:
+            self.lists_model.splice(0, 0, self._list_items)
+        finally:
+            self._updating_lists = False
+        
+        self._select_list(0 if lists else Gtk.INVALID_LIST_POSITION)
+    
+    def _select_list(self, position: int):
+        """Select the sidebar row at position and show its tasks."""
+        if self.lists_selection.get_selected() != position:
+            # notify::selected-item runs _on_list_selected
+            self.lists_selection.set_selected(position)
+        else:
+            self._on_list_selected(self.lists_selection, None)
+    
+    def _append_list_item(self, todo_list: TodoList) -> int:
+        """Add one newly created list to the end of the sidebar."""
+        item = TodoListItem(todo_list)
+        position = len(self._list_items)
+        self._list_items.append(item)
+        self._list_items_by_id[todo_list.id] = item
+        self._list_position_by_id[todo_list.id] = position
+        self._updating_lists = True
+        try:
+            self.lists_model.append(item)
+        finally:
+            self._updating_lists = False
+        return position
+    
+    def _remove_list_item(self, list_id: str):
+        """Remove one deleted list from the sidebar."""
+        position = self._list_position_by_id.pop(list_id, None)
+        if position is None:
+            return
+        was_selected = self.lists_selection.get_selected() == position
+        del self._list_items[position]
+        del self._list_items_by_id[list_id]
+        for i in range(position, len(self._list_items)):
+            self._list_position_by_id[self._list_items[i].todo_list.id] = i
+        self._updating_lists = True
+        try:
+            self.lists_model.remove(position)
+        finally:
+            self._updating_lists = False
+        
+        # Fall back to the first list, as at startup
+        if was_selected:
+            self._select_list(0 if self._list_items else Gtk.INVALID_LIST_POSITION)
     
     def _load_tasks(self):
         """Load tasks for the current list."""
-        # Clear existing
-        while True:
-            child = self.tasks_container.get_first_child()
-            if child is None:
-                break
-            self.tasks_container.remove(child)
+        pending = []
+        completed = []
+        self._task_items_by_id.clear()
+        self._tasks_list = self.current_list
+        if self.current_list:
+            for task in self.current_list.tasks:
+                item = TaskItem(task)
+                self._task_items_by_id[task.id] = item
+                (completed if task.completed else pending).append(item)
         
-        if not self.current_list:
-            return
-        
-        # Pending tasks section
-        pending = self.current_list.get_pending_tasks()
-        if pending:
-            header = Gtk.Label(label="To Do")
-            header.add_css_class("task-section-header")
-            header.set_halign(Gtk.Align.START)
-            self.tasks_container.append(header)
-            
-            for task in pending:
-                row = TaskRow(
-                    task,
-                    on_toggle=self._on_toggle_task,
-                    on_edit=self._on_edit_task,
-                    on_delete=self._on_delete_task
-                )
-                self.tasks_container.append(row)
-        
-        # Completed tasks section
-        completed = self.current_list.get_completed_tasks()
-        if completed:
-            header = Gtk.Label(label="Completed")
-            header.add_css_class("task-section-header")
-            header.set_halign(Gtk.Align.START)
-            header.set_margin_top(16)
-            self.tasks_container.append(header)
-            
-            completed_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-            completed_box.add_css_class("completed-section")
-            
-            for task in completed:
-                row = TaskRow(
-                    task,
-                    on_toggle=self._on_toggle_task,
-                    on_edit=self._on_edit_task,
-                    on_delete=self._on_delete_task
-                )
-                completed_box.append(row)
-            
-            self.tasks_container.append(completed_box)
-    
-    def _on_list_selected(self, listbox, row):
-        """Handle list selection."""
-        # Update edit button visibility for all rows
-        for i in range(100):  # Max lists
-            list_row = self.lists_box.get_row_at_index(i)
-            if list_row is None:
+        self._replace_items(self.pending_store, pending)
+        self._replace_items(self.completed_store, completed)
+    
+    def _replace_items(self, store: Gio.ListStore, items: list):
+        """Replace a store's contents, leaving an empty section untouched."""
+        n_items = store.get_n_items()
+        if n_items or items:
+            store.splice(0, n_items, items)
+    
+    def _task_store(self, task: Task) -> Gio.ListStore:
+        """Return the section store a task belongs in."""
+        return self.completed_store if task.completed else self.pending_store
+    
+    def _task_position(self, task: Task) -> int:
+        """Return the index of a task within its section store."""
+        position = 0
+        for other in self.current_list.tasks:
+            if other is task:
                 break
-            if hasattr(list_row, 'list_row_widget'):
-                list_row.list_row_widget.set_selected(list_row == row)
+            if other.completed == task.completed:
+                position += 1
+        return position
+    
+    def _update_task_title(self, task_id: str):
+        """Refresh the label of one task after its title was edited."""
+        item = self._task_items_by_id.get(task_id)
+        if item is not None:
+            item.notify("title")
+    
+    def _remove_task_item(self, item: TaskItem, store: Gio.ListStore):
+        """Remove a task's item from the section store holding it."""
+        found, position = store.find(item)
+        if found:
+            store.remove(position)
+    
+    def _update_list_name(self, list_id: str):
+        """Refresh the sidebar label of one list after a rename."""
+        item = self._list_items_by_id.get(list_id)
+        if item is not None:
+            item.notify("name")
+    
+    def _update_list_counts(self, list_id: str):
+        """Refresh the sidebar badge of one list after its tasks changed."""
+        item = self._list_items_by_id.get(list_id)
+        if item is not None:
+            item.counts_changed()
+    
+    def _request_refresh(self, list_id: str):
+        """Queue a sidebar badge refresh, coalescing bursts into one idle pass."""
+        self._pending_refresh.add(list_id)
+        if self._refresh_source is None:
+            # Low priority: badges are cosmetic and can wait for everything
+            # else queued on the main loop, including further input
+            self._refresh_source = GLib.idle_add(
+                self._flush_refresh, priority=GLib.PRIORITY_LOW
+            )
+    
+    def _flush_refresh(self):
+        """Refresh every sidebar badge queued since the last flush."""
+        self._refresh_source = None
+        pending, self._pending_refresh = self._pending_refresh, set()
+        for list_id in pending:
+            self._update_list_counts(list_id)
+        return False
+    
+    def _on_list_selected(self, selection, pspec):
+        """Handle list selection."""
+        if self._updating_lists:
+            return
         
-        if row:
-            self.current_list = row.todo_list
+        item = selection.get_selected_item()
+        if item:
+            self.current_list = item.todo_list
         else:
             self.current_list = None
         self._update_content_visibility()
-        self._load_tasks()
+        # Re-selecting the list already shown keeps its task rows
+        if self.current_list is not self._tasks_list:
+            self._load_tasks()
     
-    def _on_new_list(self, btn):
-        """Create a new list."""
-        dialog = Adw.MessageDialog(
-            transient_for=self,
-            heading="New List",
-            body="Enter a name for the new list (max 32 chars, leave empty for auto-naming):"
-        )
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response("create", "Create")
-        dialog.set_response_appearance("create", Adw.ResponseAppearance.SUGGESTED)
-        dialog.set_default_response("create")
-        
-        entry = Gtk.Entry()
-        entry.set_placeholder_text("List name (optional)")
-        entry.set_max_length(32)  # Enforce character limit in UI
-        entry.set_margin_start(12)
-        entry.set_margin_end(12)
-        dialog.set_extra_child(entry)
+    def _reuse_dialog(self, key: str, build) -> Adw.MessageDialog:
+        """Return the cached dialog for key, building it on first use.
+        
+        Dialogs are hidden rather than destroyed on close, so each one is
+        constructed (and styled) only once per window.
+        """
+        dialog = self._dialogs.get(key)
+        if dialog is None:
+            dialog = build()
+            dialog.set_hide_on_close(True)
+            dialog.response_handler = None
+            self._dialogs[key] = dialog
+        return dialog
+    
+    def _build_dialog(self, heading: str, responses: list[tuple[str, str]],
+                      default: str, appearance: dict | None = None,
+                      max_length: int | None = None) -> Adw.MessageDialog:
+        """Build a message dialog, with a text entry if max_length is given."""
+        dialog = Adw.MessageDialog(transient_for=self, heading=heading)
+        for response_id, label in responses:
+            dialog.add_response(response_id, label)
+        for response_id, response_appearance in (appearance or {}).items():
+            dialog.set_response_appearance(response_id, response_appearance)
+        dialog.set_default_response(default)
+        
+        dialog.entry = None
+        if max_length is not None:
+            entry = Gtk.Entry()
+            entry.set_max_length(max_length)  # Enforce character limit in UI
+            entry.set_margin_start(12)
+            entry.set_margin_end(12)
+            entry.connect("activate", self._on_dialog_entry_activate)
+            dialog.set_extra_child(entry)
+            dialog.entry = entry
+        return dialog
+    
+    def _prompt_text(self, heading: str, body: str, initial: str, max_len: int,
+                     ok_label: str, on_accept, placeholder: str = ""):
+        """Ask for a line of text with the shared entry dialog.
+        
+        on_accept(text) is called with the stripped entry text if the user
+        confirms. The dialog's responses are always "cancel" and "ok"; only
+        the labels change between prompts.
+        """
+        dialog = self._reuse_dialog("input", lambda: self._build_dialog(
+            "",
+            [("cancel", "Cancel"), ("ok", "OK")],
+            default="ok",
+            appearance={"ok": Adw.ResponseAppearance.SUGGESTED},
+            max_length=max_len
+        ))
+        dialog.set_heading(heading)
+        dialog.set_body(body)
+        dialog.set_response_label("ok", ok_label)
+        entry = dialog.entry
+        entry.set_max_length(max_len)  # Enforce character limit in UI
+        entry.set_text(initial)
+        entry.set_placeholder_text(placeholder)
         
         def on_response(dialog, response):
-            if response == "create":
-                name = entry.get_text().strip() or None
-                new_list = self.storage.create_list(name)
-                self._load_lists()
-                # Select the new list
-                for i in range(100):  # Max 100 lists
-                    row = self.lists_box.get_row_at_index(i)
-                    if row is None:
-                        break
-                    if row.todo_list.id == new_list.id:
-                        self.lists_box.select_row(row)
-                        break
             dialog.close()
+            if response == "ok":
+                on_accept(entry.get_text().strip())
         
-        dialog.connect("response", on_response)
-        entry.connect("activate", lambda e: dialog.response("create"))
+        self._present_dialog(dialog, on_response)
+    
+    def _get_confirm_dialog(self, heading: str, body: str, ok_label: str) -> Adw.MessageDialog:
+        """Return the shared destructive-confirmation dialog ("cancel"/"ok")."""
+        dialog = self._reuse_dialog("confirm", lambda: self._build_dialog(
+            "",
+            [("cancel", "Cancel"), ("ok", "OK")],
+            default="cancel",
+            appearance={"ok": Adw.ResponseAppearance.DESTRUCTIVE}
+        ))
+        dialog.set_heading(heading)
+        dialog.set_body(body)
+        dialog.set_response_label("ok", ok_label)
+        return dialog
+    
+    def _on_dialog_entry_activate(self, entry: Gtk.Entry):
+        """Pressing Enter in a dialog's entry picks its default response."""
+        dialog = entry.get_root()
+        dialog.response(dialog.get_default_response())
+    
+    def _present_dialog(self, dialog: Adw.MessageDialog, on_response):
+        """Show a reused dialog with this use's response handler."""
+        if dialog.response_handler is not None:
+            dialog.disconnect(dialog.response_handler)
+        dialog.response_handler = dialog.connect("response", on_response)
         dialog.present()
     
+    def _on_new_list(self, btn):
+        """Create a new list."""
+        def create(name: str):
+            new_list = self.storage.create_list(name or None)
+            # Select the new list
+            self._select_list(self._append_list_item(new_list))
+        
+        self._prompt_text(
+            "New List",
+            "Enter a name for the new list (max 32 chars, leave empty for auto-naming):",
+            "", 32, "Create", create, placeholder="List name (optional)"
+        )
+    
     def _on_edit_list(self, todo_list: TodoList):
         """Show edit options for a list (rename/delete)."""
-        dialog = Adw.MessageDialog(
-            transient_for=self,
-            heading=f"Edit \"{todo_list.name}\"",
-            body="What would you like to do with this list?"
-        )
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response("rename", "Rename")
-        dialog.add_response("delete", "Delete")
-        dialog.set_response_appearance("delete", Adw.ResponseAppearance.DESTRUCTIVE)
-        dialog.set_default_response("cancel")
+        dialog = self._reuse_dialog("edit_list", lambda: self._build_dialog(
+            "",
+            [("cancel", "Cancel"), ("rename", "Rename"), ("delete", "Delete")],
+            default="cancel",
+            appearance={"delete": Adw.ResponseAppearance.DESTRUCTIVE}
+        ))
+        dialog.set_heading(f"Edit \"{todo_list.name}\"")
+        dialog.set_body("What would you like to do with this list?")
         
         def on_response(dialog, response):
             dialog.close()
@@ -490,82 +920,55 @@ class MainWindow(Adw.ApplicationWindow):
             elif response == "delete":
                 self._show_delete_dialog(todo_list)
         
-        dialog.connect("response", on_response)
-        dialog.present()
+        self._present_dialog(dialog, on_response)
     
     def _show_rename_dialog(self, todo_list: TodoList):
         """Show rename dialog for a list."""
-        dialog = Adw.MessageDialog(
-            transient_for=self,
-            heading="Rename List",
-            body="Enter a new name for the list (max 32 characters):"
-        )
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response("rename", "Rename")
-        dialog.set_response_appearance("rename", Adw.ResponseAppearance.SUGGESTED)
-        dialog.set_default_response("rename")
-        
-        entry = Gtk.Entry()
-        entry.set_text(todo_list.name)
-        entry.set_max_length(32)  # Enforce character limit in UI
-        entry.set_margin_start(12)
-        entry.set_margin_end(12)
-        dialog.set_extra_child(entry)
-        
-        def on_response(dialog, response):
-            if response == "rename":
-                name = entry.get_text().strip()
-                if name:
-                    success = self.storage.rename_list(todo_list.id, name)
-                    if success:
-                        if self.current_list and self.current_list.id == todo_list.id:
-                            self.current_list = self.storage.get_list(todo_list.id)
-                            self._update_content_visibility()  # Update header label
-                        self._load_lists()
-                    else:
-                        # Show error - name is likely a duplicate
-                        self._show_error_dialog("Could not rename list. The name may already be in use.")
-            dialog.close()
+        def rename(name: str):
+            if not name:
+                return
+            if self.storage.rename_list(todo_list.id, name):
+                if self.current_list and self.current_list.id == todo_list.id:
+                    self._update_content_visibility()  # Update header label
+                self._update_list_name(todo_list.id)
+            else:
+                # Show error - name is likely a duplicate
+                self._show_error_dialog("Could not rename list. The name may already be in use.")
         
-        dialog.connect("response", on_response)
-        entry.connect("activate", lambda e: dialog.response("rename"))
-        dialog.present()
+        self._prompt_text(
+            "Rename List",
+            "Enter a new name for the list (max 32 characters):",
+            todo_list.name, 32, "Rename", rename
+        )
     
     def _show_error_dialog(self, message: str):
         """Show an error message dialog."""
-        dialog = Adw.MessageDialog(
-            transient_for=self,
-            heading="Error",
-            body=message
-        )
-        dialog.add_response("ok", "OK")
-        dialog.set_default_response("ok")
+        dialog = self._reuse_dialog("error", lambda: self._build_dialog(
+            "Error",
+            [("ok", "OK")],
+            default="ok"
+        ))
+        dialog.set_body(message)
         dialog.present()
     
+    def _on_storage_error(self, error: Exception):
+        """Tell the user a background save failed."""
+        self._show_error_dialog(f"Could not save your changes: {error}")
+    
     def _show_delete_dialog(self, todo_list: TodoList):
         """Show delete confirmation dialog for a list."""
-        dialog = Adw.MessageDialog(
-            transient_for=self,
-            heading="Delete List?",
-            body=f"Are you sure you want to delete \"{todo_list.name}\"? This action cannot be undone."
+        dialog = self._get_confirm_dialog(
+            "Delete List?",
+            f"Are you sure you want to delete \"{todo_list.name}\"? This action cannot be undone.",
+            ok_label="Delete"
         )
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response("delete", "Delete")
-        dialog.set_response_appearance("delete", Adw.ResponseAppearance.DESTRUCTIVE)
-        dialog.set_default_response("cancel")
         
         def on_response(dialog, response):
-            if response == "delete":
-                self.storage.delete_list(todo_list.id)
-                if self.current_list and self.current_list.id == todo_list.id:
-                    self.current_list = None
-                self._load_lists()
-                self._load_tasks()
-                self._update_content_visibility()
+            if response == "ok" and self.storage.delete_list(todo_list.id):
+                self._remove_list_item(todo_list.id)
             dialog.close()
         
-        dialog.connect("response", on_response)
-        dialog.present()
+        self._present_dialog(dialog, on_response)
     
     def _on_add_task(self, widget):
         """Add a new task to the current list."""
@@ -576,12 +979,12 @@ class MainWindow(Adw.ApplicationWindow):
         if not title:
             return
 
-        self.storage.add_task(self.current_list.id, title)
-
-        # Refresh to get updated list from storage
-        self.current_list = self.storage.get_list(self.current_list.id)
-        self._load_tasks()
-        self._load_lists()  # Update task counts
+        task = self.storage.add_task(self.current_list.id, title)
+        if task:
+            item = TaskItem(task)
+            self._task_items_by_id[task.id] = item
+            self.pending_store.append(item)
+            self._request_refresh(self.current_list.id)  # Update task counts
 
         # Clear the entry text and restore focus to avoid GTK warnings
         self.task_entry.set_text("")
@@ -592,52 +995,120 @@ class MainWindow(Adw.ApplicationWindow):
         if not self.current_list:
             return
         
-        self.storage.toggle_task(self.current_list.id, task_id)
-        self.current_list = self.storage.get_list(self.current_list.id)
-        self._load_tasks()
-        self._load_lists()  # Update task counts
+        if not self.storage.toggle_task(self.current_list.id, task_id):
+            return
+        
+        # Move the task over to its new section; it can only have come from
+        # the other one
+        item = self._task_items_by_id[task_id]
+        if item.task.completed:
+            old_store, new_store = self.pending_store, self.completed_store
+        else:
+            old_store, new_store = self.completed_store, self.pending_store
+        self._remove_task_item(item, old_store)
+        new_store.insert(self._task_position(item.task), item)
+        self._request_refresh(self.current_list.id)  # Update task counts
     
     def _on_edit_task(self, task: Task):
         """Edit a task."""
         if not self.current_list:
             return
         
-        dialog = Adw.MessageDialog(
-            transient_for=self,
-            heading="Edit Task",
-            body="Update the task description:"
+        list_id = self.current_list.id
+        
+        def save(title: str):
+            if title and self.storage.update_task(list_id, task.id, title):
+                self._update_task_title(task.id)
+        
+        self._prompt_text(
+            "Edit Task",
+            "Update the task description:",
+            task.title, 256, "Save", save  # 256: task title limit
         )
-        dialog.add_response("cancel", "Cancel")
-        dialog.add_response("save", "Save")
-        dialog.set_response_appearance("save", Adw.ResponseAppearance.SUGGESTED)
-        dialog.set_default_response("save")
-        
-        entry = Gtk.Entry()
-        entry.set_text(task.title)
-        entry.set_max_length(256)  # Enforce task title limit
-        entry.set_margin_start(12)
-        entry.set_margin_end(12)
-        dialog.set_extra_child(entry)
+    
+    def _find_task_row(self, widget: Gtk.Widget | None) -> TaskRow | None:
+        """Return the task row containing widget within the task list view."""
+        while widget is not None and widget is not self.tasks_view:
+            if isinstance(widget, TaskRow):
+                return widget
+            widget = widget.get_parent()
+        return None
+    
+    def _on_task_menu_requested(self, x: float, y: float):
+        """Open the task menu for the row at (x, y) in the task list view."""
+        row = self._find_task_row(self.tasks_view.pick(x, y, Gtk.PickFlags.DEFAULT))
+        if row and row.task:
+            _, row_x, row_y = self.tasks_view.translate_coordinates(row, x, y)
+            self._show_task_menu(row.task, row, row_x, row_y)
+    
+    def _on_task_menu_key(self, widget, args) -> bool:
+        """Open the task menu for the focused row (Menu or Shift+F10)."""
+        focus = self.get_focus()
+        # Focus is either inside a row or on the list's own row widget
+        row = self._find_task_row(focus)
+        if row is None and focus is not None:
+            row = self._find_task_row(focus.get_first_child())
+        if row is None or not row.task:
+            return False
+        self._show_task_menu(row.task, row, row.get_width() / 2, row.get_height() / 2)
+        return True
+    
+    def _show_task_menu(self, task: Task, row: TaskRow, x: float, y: float):
+        """Pop up the shared Edit/Delete menu for a task at (x, y) in row."""
+        popover = self._task_popover
+        if popover is None:
+            popover = self._task_popover = self._build_task_popover()
         
-        def on_response(dialog, response):
-            if response == "save":
-                title = entry.get_text().strip()
-                if title:
-                    self.storage.update_task(self.current_list.id, task.id, title)
-                    self.current_list = self.storage.get_list(self.current_list.id)
-                    self._load_tasks()
-            dialog.close()
+        if popover.get_parent() is not None:
+            popover.unparent()
+        popover.set_parent(row)
+        self._popover_task = task
+        rect = Gdk.Rectangle()
+        rect.x, rect.y, rect.width, rect.height = int(x), int(y), 1, 1
+        popover.set_pointing_to(rect)
+        popover.popup()
+    
+    def _build_task_popover(self) -> Gtk.Popover:
+        """Build the task menu popover on first use."""
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         
-        dialog.connect("response", on_response)
-        entry.connect("activate", lambda e: dialog.response("save"))
-        dialog.present()
+        edit_btn = Gtk.Button(label="Edit")
+        edit_btn.add_css_class("flat")
+        edit_btn.connect("clicked", self._on_popover_edit)
+        box.append(edit_btn)
+        
+        delete_btn = Gtk.Button(label="Delete")
+        delete_btn.add_css_class("flat")
+        delete_btn.add_css_class("destructive-action")
+        delete_btn.connect("clicked", self._on_popover_delete)
+        box.append(delete_btn)
+        
+        popover = Gtk.Popover()
+        popover.set_has_arrow(False)
+        popover.set_child(box)
+        # Detach from the row once closed so recycled rows never keep it
+        popover.connect("closed", lambda popover: popover.unparent())
+        return popover
+    
+    def _on_popover_edit(self, btn):
+        self._task_popover.popdown()
+        if self._popover_task:
+            self._on_edit_task(self._popover_task)
+    
+    def _on_popover_delete(self, btn):
+        self._task_popover.popdown()
+        if self._popover_task:
+            self._on_delete_task(self._popover_task.id)
     
     def _on_delete_task(self, task_id: str):
         """Delete a task."""
         if not self.current_list:
             return
         
-        self.storage.delete_task(self.current_list.id, task_id)
-        self.current_list = self.storage.get_list(self.current_list.id)
-        self._load_tasks()
-        self._load_lists()  # Update task counts
+        if not self.storage.delete_task(self.current_list.id, task_id):
+            return
+        
+        item = self._task_items_by_id.pop(task_id, None)
+        if item:
+            self._remove_task_item(item, self._task_store(item.task))
+        self._request_refresh(self.current_list.id)  # Update task counts